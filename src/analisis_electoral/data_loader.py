@@ -1,15 +1,19 @@
 """Lectura y normalización de los resultados electorales desde Excel."""
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from importlib.util import find_spec
 from pathlib import Path
 import re
+import sys
 from typing import List
 
+import numpy as np
 import pandas as pd
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CandidateResult:
     """Resultado individual de una candidatura."""
 
@@ -22,7 +26,7 @@ class CandidateResult:
     pact_code: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PactResult:
     """Resultado agregado para un pacto/lista dentro de una circunscripción."""
 
@@ -36,7 +40,13 @@ class PactResult:
     candidates: List[CandidateResult] = field(default_factory=list)
 
 
-@dataclass
+def candidate_sort_key(candidate: CandidateResult) -> tuple[int, int, str]:
+    """Orden de preferencia dentro de un pacto: más votos, luego número de papeleta."""
+
+    return (-candidate.votes, candidate.number, candidate.name)
+
+
+@dataclass(slots=True)
 class CircunscripcionResult:
     """Resultados de una circunscripción senatorial o distrito de diputados."""
 
@@ -54,36 +64,72 @@ SUMMARY_PREFIXES = (
     "resultados preliminares",
 )
 
+TABLE_COLUMNS = (
+    "Lista/Pacto",
+    "Unnamed: 1",
+    "Partido",
+    "Votos",
+    "Porcentaje",
+    "Candidatos",
+    "Electos",
+)
+
+_SEATS_PATTERN = re.compile(r"(\d+)\s+(senadores|diputados)\s+a\s+elegir")
+_NUMBER_PATTERN = re.compile(r"(\d+)")
+_SENATE_PATTERN = re.compile(r"CIRCUNSCRIPCIÓN SENATORIAL\s*(\d+)")
+_DISTRICT_PATTERN = re.compile(r"DISTRITO\s*(\d+)")
+_CANDIDATE_PATTERN = re.compile(r"(\d+)\s+(.*)")
+_NON_DIGITS_PATTERN = re.compile(r"[^0-9]")
+
+# Fila (base 0) donde comienza la tabla de pactos y candidaturas.
+HEADER_ROW = 10
 
-def load_circunscripciones(inputs_dir: Path | str) -> List[CircunscripcionResult]:
-    """Carga todas las circunscripciones disponibles en ``inputs_dir``."""
+# ``python-calamine`` lee los Excel bastante más rápido que openpyxl; si no está
+# instalado se usa el motor por defecto.
+_EXCEL_ENGINE = "calamine" if find_spec("python_calamine") else "openpyxl"
+
+
+def load_circunscripciones(
+    inputs_dir: Path | str, max_workers: int = 1
+) -> List[CircunscripcionResult]:
+    """Carga todas las circunscripciones disponibles en ``inputs_dir``.
+
+    Por defecto los archivos se leen secuencialmente; con ``max_workers``
+    mayor que 1 se leen en paralelo con hasta esa cantidad de procesos.
+    """
 
     directory = Path(inputs_dir)
     if not directory.exists():
         raise FileNotFoundError(f"No se encontró la carpeta {directory}")
 
-    circunscripciones: List[CircunscripcionResult] = []
-    for path in sorted(directory.glob("*.xlsx")):
-        circunscripciones.append(_parse_file(path))
-    if not circunscripciones:
+    paths = sorted(directory.glob("*.xlsx"))
+    if not paths:
         raise ValueError(f"No se encontraron archivos Excel en {directory}")
-    return circunscripciones
+
+    workers = min(max_workers, len(paths))
+    if workers <= 1:
+        return [_parse_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_parse_file, paths))
 
 
 def _parse_file(path: Path) -> CircunscripcionResult:
-    df = pd.read_excel(path, header=10)
-    seats = _extract_seats(path)
+    cells = pd.read_excel(path, header=None, engine=_EXCEL_ENGINE).to_numpy(dtype=object)
+    # El número de escaños aparece en el encabezado, antes de la tabla.
+    seats = _extract_seats(cells[:HEADER_ROW, 0], path)
     circ_id, circ_label = _extract_circunscripcion_metadata(path)
 
+    labels, candidate_fields, parties, votes, percentages, slots, electos = _table_columns(cells)
+
     pacts: List[PactResult] = []
     current_pact: PactResult | None = None
-    for _, row in df.iterrows():
-        raw_label = row.get("Lista/Pacto")
+    for index in range(_table_end(labels)):
+        raw_label = labels[index]
         if isinstance(raw_label, str) and raw_label.strip():
             label = raw_label.strip()
-            if _is_summary_row(label):
-                break
-            current_pact = _build_pact(label, row)
+            current_pact = _build_pact(
+                label, votes[index], percentages[index], slots[index], electos[index]
+            )
             pacts.append(current_pact)
             continue
 
@@ -91,11 +137,23 @@ def _parse_file(path: Path) -> CircunscripcionResult:
             # Todavía no llegamos a la primera lista.
             continue
 
-        candidate_field = row.get("Unnamed: 1")
+        candidate_field = candidate_fields[index]
         if isinstance(candidate_field, str) and candidate_field.strip():
-            candidate = _build_candidate(candidate_field, row, current_pact.code)
+            candidate = _build_candidate(
+                candidate_field,
+                parties[index],
+                votes[index],
+                percentages[index],
+                electos[index],
+                current_pact.code,
+            )
             current_pact.candidates.append(candidate)
 
+    # Dejamos las candidaturas en su orden de preferencia para que los pasos
+    # posteriores trabajen sobre listas ya ordenadas.
+    for pact in pacts:
+        pact.candidates.sort(key=candidate_sort_key)
+
     return CircunscripcionResult(
         circunscripcion_id=circ_id,
         circunscripcion_label=circ_label,
@@ -104,16 +162,44 @@ def _parse_file(path: Path) -> CircunscripcionResult:
     )
 
 
-def _extract_seats(path: Path) -> int:
-    df = pd.read_excel(path, header=None)
-    for value in df.iloc[:, 0].dropna():
+def _table_columns(cells: np.ndarray) -> List[np.ndarray]:
+    """Columnas de ``TABLE_COLUMNS`` bajo la fila ``HEADER_ROW`` de la hoja.
+
+    Los nombres se resuelven igual que ``read_excel(header=HEADER_ROW)``: las
+    celdas vacías del encabezado pasan a llamarse ``"Unnamed: <posición>"``.
+    Las columnas ausentes se devuelven llenas de ``None``.
+    """
+
+    header = [
+        value if isinstance(value, str) else f"Unnamed: {index}"
+        for index, value in enumerate(cells[HEADER_ROW])
+    ]
+    body = cells[HEADER_ROW + 1 :]
+    missing = np.full(len(body), None, dtype=object)
+    return [
+        body[:, header.index(column)] if column in header else missing
+        for column in TABLE_COLUMNS
+    ]
+
+
+def _table_end(labels: np.ndarray) -> int:
+    """Índice de la primera fila de totales (votos nulos, blancos, etc.)."""
+
+    for index, value in enumerate(labels):
+        if isinstance(value, str) and _is_summary_row(value):
+            return index
+    return len(labels)
+
+
+def _extract_seats(first_column: np.ndarray, path: Path) -> int:
+    for value in first_column:
         if not isinstance(value, str):
             continue
         value_lower = value.lower()
-        match = re.search(r"(\d+)\s+(senadores|diputados)\s+a\s+elegir", value_lower)
+        match = _SEATS_PATTERN.search(value_lower)
         if match:
             return int(match.group(1))
-        generic_match = re.search(r"(\d+)", value_lower)
+        generic_match = _NUMBER_PATTERN.search(value_lower)
         if generic_match and ("senadores" in value_lower or "diputados" in value_lower):
             return int(generic_match.group(1))
     raise ValueError(f"No pude determinar el número de escaños para {path}")
@@ -121,12 +207,12 @@ def _extract_seats(path: Path) -> int:
 
 def _extract_circunscripcion_metadata(path: Path) -> tuple[str, str]:
     name = path.name.upper()
-    senate_match = re.search(r"CIRCUNSCRIPCIÓN SENATORIAL\s*(\d+)", name)
+    senate_match = _SENATE_PATTERN.search(name)
     if senate_match:
         circ_id = senate_match.group(1)
         return circ_id, f"Circunscripción Senatorial {circ_id}"
 
-    district_match = re.search(r"DISTRITO\s*(\d+)", name)
+    district_match = _DISTRICT_PATTERN.search(name)
     if district_match:
         circ_id = district_match.group(1)
         return circ_id, f"Distrito {circ_id}"
@@ -136,29 +222,30 @@ def _extract_circunscripcion_metadata(path: Path) -> tuple[str, str]:
 
 
 def _is_summary_row(value: str) -> bool:
-    value_lower = value.strip().lower()
-    return any(value_lower.startswith(prefix) for prefix in SUMMARY_PREFIXES)
+    return value.strip().lower().startswith(SUMMARY_PREFIXES)
 
 
-def _build_pact(label: str, row: pd.Series) -> PactResult:
+def _build_pact(label: str, votes, percentage, candidate_slots, seats_won) -> PactResult:
     if " - " in label:
         code, name = [part.strip() for part in label.split(" - ", 1)]
     else:
         code, name = label.strip(), label.strip()
 
     return PactResult(
-        code=code,
+        code=sys.intern(code),
         name=name,
         label=label,
-        votes=_parse_int(row.get("Votos")),
-        percentage=_parse_percentage(row.get("Porcentaje")),
-        candidate_slots=_parse_int(row.get("Candidatos")),
-        seats_won=_parse_int(row.get("Electos")),
+        votes=_parse_int(votes),
+        percentage=_parse_percentage(percentage),
+        candidate_slots=_parse_int(candidate_slots),
+        seats_won=_parse_int(seats_won),
     )
 
 
-def _build_candidate(raw_value: str, row: pd.Series, pact_code: str) -> CandidateResult:
-    match = re.match(r"(\d+)\s+(.*)", raw_value.strip())
+def _build_candidate(
+    raw_value: str, party, votes, percentage, electos_raw, pact_code: str
+) -> CandidateResult:
+    match = _CANDIDATE_PATTERN.match(raw_value.strip())
     if match:
         number = int(match.group(1))
         name = match.group(2).strip()
@@ -166,15 +253,14 @@ def _build_candidate(raw_value: str, row: pd.Series, pact_code: str) -> Candidat
         number = 0
         name = raw_value.strip()
 
-    electos_raw = row.get("Electos")
     elected = isinstance(electos_raw, str) and "✓" in electos_raw
 
     return CandidateResult(
         number=number,
         name=name,
-        party=_parse_str(row.get("Partido")),
-        votes=_parse_int(row.get("Votos")),
-        percentage=_parse_percentage(row.get("Porcentaje")),
+        party=_parse_party(party),
+        votes=_parse_int(votes),
+        percentage=_parse_percentage(percentage),
         elected=elected,
         pact_code=pact_code,
     )
@@ -186,7 +272,7 @@ def _parse_int(value) -> int:
     if isinstance(value, (int, float)) and not isinstance(value, bool):
         return int(value)
     if isinstance(value, str):
-        digits = re.sub(r"[^0-9]", "", value)
+        digits = _NON_DIGITS_PATTERN.sub("", value)
         return int(digits) if digits else 0
     return int(value)
 
@@ -203,6 +289,13 @@ def _parse_percentage(value) -> float | None:
     return None
 
 
+def _parse_party(value) -> str | None:
+    # Los partidos se repiten en muchas candidaturas; internarlos deja una sola
+    # copia de cada uno.
+    text = _parse_str(value)
+    return sys.intern(text) if text is not None else None
+
+
 def _parse_str(value) -> str | None:
     if value is None or (isinstance(value, float) and pd.isna(value)):
         return None
@@ -212,6 +305,7 @@ def _parse_str(value) -> str | None:
 
 __all__ = [
     "CandidateResult",
+    "candidate_sort_key",
     "PactResult",
     "CircunscripcionResult",
     "load_circunscripciones",
@@ -1,9 +1,11 @@
 """Implementación del método D'Hondt con cifra repartidora."""
 from __future__ import annotations
 
-from collections import Counter
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Protocol
+import heapq
+from typing import Dict, Iterable, List, Protocol, Sequence
+
+import numpy as np
 
 
 class SupportsDhondt(Protocol):
@@ -13,7 +15,7 @@ class SupportsDhondt(Protocol):
     votes: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DhondtSeat:
     """Representa una cuota calculada en el método D'Hondt."""
 
@@ -24,26 +26,149 @@ class DhondtSeat:
 
 
 def dhondt_allocation(pacts: Iterable[SupportsDhondt], seats: int) -> Dict[str, int]:
-    """Entrega el número de escaños que obtiene cada pacto."""
-
-    quotients: List[DhondtSeat] = []
-    for pact in pacts:
-        if pact.votes <= 0:
-            continue
-        for divisor in range(1, seats + 1):
-            quotients.append(
-                DhondtSeat(
-                    pact_code=pact.code,
-                    quotient=pact.votes / divisor,
-                    divisor=divisor,
-                    raw_votes=pact.votes,
-                )
-            )
+    """Entrega el número de escaños que obtiene cada pacto.
+
+    Los empates en la cuota se resuelven a favor del pacto con más votos y, si
+    persisten, por orden alfabético del código.
+    """
+
+    active = [pact for pact in pacts if pact.votes > 0]
+    if seats <= 0 or not active:
+        return {}
+
+    codes = [pact.code for pact in active]
+    counts = dhondt_seat_counts([pact.votes for pact in active], seats, codes)
+    allocation: Dict[str, int] = {}
+    for code, count in zip(codes, counts):
+        if count:
+            allocation[code] = allocation.get(code, 0) + count
+    return allocation
+
+
+def dhondt_seat_counts(
+    votes: Sequence[float], seats: int, codes: Sequence[str] | None = None
+) -> List[int]:
+    """Escaños que obtiene cada posición de ``votes``.
 
+    Es el núcleo de ``dhondt_allocation`` sobre votos planos, para quien ya
+    tiene los votos en una lista o arreglo. Las posiciones sin votos positivos
+    no reciben escaños. ``codes`` solo se usa para el último desempate; si no
+    se entrega, gana la posición menor.
+    """
+
+    counts = [0] * len(votes)
+    positions = [index for index, value in enumerate(votes) if value > 0]
+    if seats <= 0 or not positions:
+        return counts
+
+    tie_keys: Sequence = codes if codes is not None else range(len(votes))
+    guaranteed = _guaranteed_seats(votes, positions, seats)
+    for index, count in _heap_seat_counts(votes, tie_keys, positions, guaranteed, seats):
+        counts[index] = count
+    return counts
+
+
+def dhondt_quotients(pacts: Iterable[SupportsDhondt], seats: int) -> List[DhondtSeat]:
+    """Tabla de cuotas ordenada de mayor a menor, útil para revisar un reparto."""
+
+    quotients = [
+        DhondtSeat(
+            pact_code=pact.code,
+            quotient=pact.votes / divisor,
+            divisor=divisor,
+            raw_votes=pact.votes,
+        )
+        for pact in pacts
+        if pact.votes > 0
+        for divisor in range(1, seats + 1)
+    ]
     quotients.sort(key=lambda seat: (-seat.quotient, -seat.raw_votes, seat.pact_code))
-    winners = quotients[:seats]
-    counter: Counter[str] = Counter(seat.pact_code for seat in winners)
-    return dict(counter)
+    return quotients
+
+
+def dhondt_seat_counts_batch(
+    votes: np.ndarray, seats: np.ndarray | int, code_rank: np.ndarray | None = None
+) -> np.ndarray:
+    """Aplica ``dhondt_seat_counts`` a muchos escenarios en una sola operación.
+
+    ``votes`` tiene forma ``(..., n)``: cada fila es un escenario con ``n``
+    pactos (se puede rellenar con ceros). ``seats`` se ajusta por broadcasting a
+    ``votes.shape[:-1]``. ``code_rank``, con la misma forma que ``votes``, define
+    el último desempate; si no se entrega, gana la posición menor.
+    """
+
+    votes = np.asarray(votes, dtype=np.float64)
+    shape = votes.shape
+    n = shape[-1]
+    rows = votes.reshape(-1, n)
+    row_seats = np.broadcast_to(np.asarray(seats, dtype=np.int64), shape[:-1]).reshape(-1)
+    if code_rank is None:
+        ranks = np.broadcast_to(np.arange(n), rows.shape)
+    else:
+        ranks = np.broadcast_to(np.asarray(code_rank), shape).reshape(-1, n)
+
+    max_seats = int(row_seats.max(initial=0))
+    counts = np.zeros(rows.shape, dtype=np.int64)
+    if max_seats <= 0 or n == 0:
+        return counts.reshape(shape)
+
+    divisors = np.arange(1, max_seats + 1, dtype=np.float64)
+    quotients = rows[:, :, None] / divisors
+    valid = (rows[:, :, None] > 0) & (divisors <= row_seats[:, None, None])
+    quotients = np.where(valid, quotients, -np.inf).reshape(len(rows), -1)
+    raw_votes = np.repeat(rows, max_seats, axis=1)
+    tie_ranks = np.repeat(ranks, max_seats, axis=1)
+
+    order = np.lexsort((tie_ranks, -raw_votes, -quotients))
+    ordered_valid = np.take_along_axis(valid.reshape(len(rows), -1), order, axis=1)
+    selected = ordered_valid & (np.arange(order.shape[1]) < row_seats[:, None])
+    row_index, position = np.nonzero(selected)
+    np.add.at(counts, (row_index, order[row_index, position] // max_seats), 1)
+    return counts.reshape(shape)
+
+
+def _guaranteed_seats(votes: Sequence[float], positions: List[int], seats: int) -> List[int]:
+    """Escaños que cada posición obtiene con seguridad, sin comparar cuotas.
+
+    Toda cuota mayor que ``total / seats`` resulta electa: hay a lo sumo
+    ``seats`` de ellas y superan a todas las demás. Para la posición ``i`` son
+    ``floor(votes[i] * seats / total)``; se descuenta una para no depender del
+    redondeo con votos fraccionarios. Quedan a lo sumo ``2·n`` escaños por
+    repartir, sin importar cuántos escaños haya en total.
+    """
+
+    total = sum(votes[index] for index in positions)
+    return [max(int(votes[index] * seats / total) - 1, 0) for index in positions]
+
+
+def _heap_seat_counts(
+    votes: Sequence[float],
+    tie_keys: Sequence,
+    positions: List[int],
+    guaranteed: List[int],
+    seats: int,
+) -> List[tuple[int, int]]:
+    # Cada pacto aporta al heap solo su próxima cuota después de los escaños
+    # garantizados, así que nunca se arma la tabla completa. El orden de la
+    # clave es el desempate de D'Hondt: cuota, votos y código.
+    heap = [
+        (-votes[index] / (start + 1), -votes[index], tie_keys[index], index, start + 1)
+        for index, start in zip(positions, guaranteed)
+    ]
+    heapq.heapify(heap)
+    for _ in range(seats - sum(guaranteed)):
+        _, negative_votes, tie_key, index, divisor = heap[0]
+        heapq.heapreplace(
+            heap, (negative_votes / (divisor + 1), negative_votes, tie_key, index, divisor + 1)
+        )
+    return [(index, divisor - 1) for _, _, _, index, divisor in heap]
 
 
-__all__ = ["dhondt_allocation", "DhondtSeat", "SupportsDhondt"]
+__all__ = [
+    "dhondt_allocation",
+    "dhondt_quotients",
+    "dhondt_seat_counts",
+    "dhondt_seat_counts_batch",
+    "DhondtSeat",
+    "SupportsDhondt",
+]
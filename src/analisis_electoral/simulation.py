@@ -3,11 +3,19 @@ from __future__ import annotations
 
 import argparse
 from collections import Counter, defaultdict
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+import heapq
+import io
+import itertools
 import re
 import sys
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import AbstractSet, Callable, Dict, Iterable, List, Mapping, Sequence, TextIO, Tuple
+
+import numpy as np
 
 if __package__ in (None, ""):
     # Permite ejecutar este archivo directamente (por ejemplo, desde Spyder)
@@ -20,12 +28,26 @@ from analisis_electoral.data_loader import (
     CandidateResult,
     CircunscripcionResult,
     PactResult,
+    candidate_sort_key,
     load_circunscripciones,
 )
-from analisis_electoral.dhondt import dhondt_allocation
+from analisis_electoral.dhondt import (
+    SupportsDhondt,
+    dhondt_allocation,
+    dhondt_seat_counts,
+    dhondt_seat_counts_batch,
+)
+
+_IND_PARTY_PATTERN = re.compile(r"^IND\s*-\s*(.+)$", re.IGNORECASE)
+
 
+def main(argv: Sequence[str] | None = None, out: TextIO | None = None) -> None:
+    """Punto de entrada de la CLI; la salida se escribe en ``out`` (por defecto stdout).
+
+    Cada bloque se arma en memoria y se escribe de una vez, para no emitir una
+    escritura por línea.
+    """
 
-def main(argv: Sequence[str] | None = None) -> None:
     parser = argparse.ArgumentParser(
         description=(
             "Simula cómo cambiaría la asignación de escaños si dos pactos electorales "
@@ -44,8 +66,8 @@ def main(argv: Sequence[str] | None = None) -> None:
         default=None,
         help="IDs de circunscripción a analizar (por ejemplo: 1 2 3). Si no se indica se usan todas.",
     )
-    parser.add_argument("--pact-a", required=True, help="Código del primer pacto (por ejemplo C)")
-    parser.add_argument("--pact-b", required=True, help="Código del segundo pacto (por ejemplo J)")
+    parser.add_argument("--pact-a", help="Código del primer pacto (por ejemplo C)")
+    parser.add_argument("--pact-b", help="Código del segundo pacto (por ejemplo J)")
     parser.add_argument(
         "--print-all",
         action="store_true",
@@ -54,11 +76,44 @@ def main(argv: Sequence[str] | None = None) -> None:
             "imprimen los que presentan cambios."
         ),
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Procesos para leer y analizar las circunscripciones en paralelo (por defecto 1).",
+    )
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help=(
+            "Evalúa todas las parejas de pactos y muestra cuántos escaños ganaría o perdería "
+            "cada alianza. No admite --pact-a, --pact-b ni --print-all."
+        ),
+    )
     args = parser.parse_args(argv)
+    if args.sweep and (args.pact_a or args.pact_b or args.print_all):
+        parser.error("--sweep no admite --pact-a, --pact-b ni --print-all")
+    if not args.sweep and not (args.pact_a and args.pact_b):
+        parser.error("se requieren --pact-a y --pact-b (o bien --sweep)")
+
+    out = out if out is not None else sys.stdout
+    buffer = io.StringIO()
 
-    circunscripciones = load_circunscripciones(args.inputs)
+    circunscripciones = load_circunscripciones(args.inputs, max_workers=args.jobs)
     circ_filter = {cid for cid in args.circ} if args.circ else None
-    pact_codes = {args.pact_a.strip().upper(), args.pact_b.strip().upper()}
+    selected = [
+        circ
+        for circ in circunscripciones
+        if not circ_filter or circ.circunscripcion_id in circ_filter
+    ]
+    if args.sweep:
+        with redirect_stdout(buffer):
+            _print_sweep(_sweep_pact_pairs(selected))
+        _flush_output(buffer, out)
+        return
+
+    pact_codes = frozenset({args.pact_a.strip().upper(), args.pact_b.strip().upper()})
+    scenario_codes = " + ".join(sorted(pact_codes))
 
     summary_official: Counter[str] = Counter()
     summary_scenario: Counter[str] = Counter()
@@ -71,123 +126,284 @@ def main(argv: Sequence[str] | None = None) -> None:
     national_scenario_seats = 0
     national_merged_votes = 0.0
 
-    for circ in circunscripciones:
-        if circ_filter and circ.circunscripcion_id not in circ_filter:
-            continue
-
-        original_allocation = dhondt_allocation(circ.pacts, circ.seats)
-        _record_pact_names(pact_names, circ.pacts)
-        try:
-            merged_pacts, merged_label, merged_original_codes = _merge_pacts(
-                circ.pacts, pact_codes
-            )
-        except ValueError as exc:
-            print(f"\nNo fue posible crear el escenario: {exc}")
+    for report in _process_circs(
+        selected, pact_codes, scenario_codes, args.print_all, args.jobs
+    ):
+        out.write(report.text)
+        for code, name in report.pact_names.items():
+            pact_names.setdefault(code, name)
+        if report.national is None:
             continue
-        merged_allocation = dhondt_allocation(merged_pacts, circ.seats)
-        for pact in merged_pacts:
-            pact_names.setdefault(pact.code, pact.name)
         processed_any = True
 
-        original_winners = _winners_by_pact(circ.pacts, original_allocation)
-        merged_winners = _winners_by_pact(merged_pacts, merged_allocation)
-        has_changes = _has_result_changes(original_winners, merged_winners)
-        should_print = args.print_all or has_changes
-
-        combined_original_seats = _combined_seats(original_allocation, merged_original_codes)
-        merged_seats = merged_allocation.get(merged_label, 0)
-        indifference_loss = _indifference_loss_percentage(
-            merged_pacts,
-            merged_label,
-            circ.seats,
-            combined_original_seats,
-            merged_seats,
-        )
-        national_entries.append(
-            _NationalScenario(
-                merged_pacts=tuple(merged_pacts),
-                merged_label=merged_label,
-                seats=circ.seats,
-            )
-        )
-        national_baseline_seats += combined_original_seats
-        national_scenario_seats += merged_seats
+        national_entries.append(report.national)
+        national_baseline_seats += report.baseline_seats
+        national_scenario_seats += report.merged_seats
+        if report.merged_breakdown:
+            summary_breakdowns[report.national.merged_label].update(report.merged_breakdown)
+        summary_official.update(report.original_allocation)
+        summary_scenario.update(report.merged_allocation)
+        summary_scenario_by_origin.update(report.distributed_allocation)
+        if report.merged_votes:
+            national_merged_votes += report.merged_votes
 
-        merged_breakdown = _merged_breakdown_counts(merged_label, merged_winners)
-        if merged_breakdown:
-            summary_breakdowns[merged_label].update(merged_breakdown)
+    national_loss = _national_indifference_loss(
+        national_entries, national_baseline_seats, national_scenario_seats
+    )
 
-        summary_official.update(original_allocation)
-        summary_scenario.update(merged_allocation)
-        distributed_allocation = _distribute_allocation_by_origin(
-            merged_allocation, merged_label, merged_breakdown
+    if processed_any:
+        with redirect_stdout(buffer):
+            _print_summary(
+                summary_official,
+                summary_scenario,
+                summary_scenario_by_origin,
+                pact_names,
+                summary_breakdowns,
+                national_loss,
+                national_merged_votes,
+            )
+        _flush_output(buffer, out)
+
+
+def _process_circs(
+    circunscripciones: Sequence[CircunscripcionResult],
+    pact_codes: AbstractSet[str],
+    scenario_codes: str,
+    print_all: bool,
+    max_workers: int,
+) -> List[_CircReport]:
+    """Analiza cada circunscripción, en paralelo si ``max_workers`` es mayor que 1.
+
+    Los informes se entregan en el mismo orden de ``circunscripciones``.
+    """
+
+    process = partial(
+        _process_circ,
+        pact_codes=pact_codes,
+        scenario_codes=scenario_codes,
+        print_all=print_all,
+    )
+    workers = min(max_workers, len(circunscripciones))
+    if workers <= 1:
+        return [process(circ) for circ in circunscripciones]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(process, circunscripciones))
+
+
+def _process_circ(
+    circ: CircunscripcionResult,
+    pact_codes: AbstractSet[str],
+    scenario_codes: str,
+    print_all: bool,
+) -> _CircReport:
+    """Compara el reparto oficial de ``circ`` con el del escenario unido.
+
+    No depende de las demás circunscripciones; ``main`` acumula los informes.
+    ``scenario_codes`` es el título del escenario, armado una vez en ``main``.
+    """
+
+    pact_names: Dict[str, str] = {}
+    original_allocation = _cached_dhondt(circ.pacts, circ.seats)
+    _record_pact_names(pact_names, circ.pacts)
+    try:
+        merged_pacts, merged_label, merged_original_codes, merged_total = _merge_pacts(
+            circ.pacts, pact_codes
+        )
+    except ValueError as exc:
+        return _CircReport(
+            text=f"\nNo fue posible crear el escenario: {exc}\n", pact_names=pact_names
         )
-        summary_scenario_by_origin.update(distributed_allocation)
-        merged_votes = _pact_votes(merged_pacts, merged_label)
-        if merged_votes:
-            national_merged_votes += merged_votes
+    merged_allocation = _cached_dhondt(merged_pacts, circ.seats)
+    # Los demás pactos ya quedaron registrados; ``_merge_pacts`` deja el
+    # pacto unido al final.
+    pact_names.setdefault(merged_label, merged_pacts[-1].name)
+
+    original_lookup = _pact_lookup(circ.pacts)
+    merged_lookup = _pact_lookup(merged_pacts)
+    original_winners = _winners_by_pact(original_lookup, original_allocation)
+    merged_winners, merged_breakdown, distributed_allocation = _merged_scenario_winners(
+        merged_lookup, merged_allocation, merged_label
+    )
+    if merged_allocation == original_allocation:
+        # Mismo reparto por pacto: o solo uno de los pactos compite aquí, o
+        # ni el pacto unido ni los originales obtienen escaños. En ambos
+        # casos los electos son los mismos.
+        has_changes = False
+    else:
+        has_changes = _has_result_changes(original_winners, merged_winners)
 
-        if not should_print:
-            continue
+    combined_original_seats = _combined_seats(original_allocation, merged_original_codes)
+    merged_seats = merged_allocation.get(merged_label, 0)
+    # Los umbrales de pérdida se calculan una vez y sirven tanto para esta
+    # circunscripción como para el total nacional.
+    loss_thresholds = tuple(
+        _loss_thresholds(merged_pacts, merged_label, circ.seats, range(circ.seats))
+    )
+    indifference_loss = _indifference_loss_percentage(
+        merged_pacts,
+        merged_label,
+        circ.seats,
+        combined_original_seats,
+        merged_seats,
+        thresholds=loss_thresholds,
+    )
+    merged_votes = float(merged_total)
 
-        print(f"\n=== {circ.circunscripcion_label} ({circ.seats} escaños) ===")
-        _print_pact_table(circ.pacts)
+    buffer = io.StringIO()
+    if print_all or has_changes:
+        with redirect_stdout(buffer):
+            print(f"\n=== {circ.circunscripcion_label} ({circ.seats} escaños) ===")
+            _print_pact_table(circ.pacts)
 
-        print("\n> Resultado oficial con los pactos originales:")
-        _print_allocation(original_allocation, circ.pacts)
+            print("\n> Resultado oficial con los pactos originales:")
+            _print_allocation(original_allocation, original_lookup)
 
-        print("\n> Escenario si se unen {0}:".format(" + ".join(sorted(pact_codes))))
-        _print_allocation(merged_allocation, merged_pacts)
+            print(f"\n> Escenario si se unen {scenario_codes}:")
+            _print_allocation(merged_allocation, merged_lookup)
 
-        _print_indifference_loss(indifference_loss, merged_votes)
+            _print_indifference_loss(indifference_loss, merged_votes)
 
-        _print_winners("Electos oficiales", original_winners)
-        _print_winners("Electos en el escenario", merged_winners)
-        _print_merged_breakdown(merged_label, merged_breakdown)
+            _print_winners("Electos oficiales", original_winners)
+            _print_winners("Electos en el escenario", merged_winners)
+            _print_merged_breakdown(merged_label, merged_breakdown)
 
-        if not has_changes:
-            print("\n   No hay cambios respecto al resultado oficial.")
+            if not has_changes:
+                print("\n   No hay cambios respecto al resultado oficial.")
 
-    national_loss = _national_indifference_loss(
-        national_entries, national_baseline_seats, national_scenario_seats
+    return _CircReport(
+        text=buffer.getvalue(),
+        pact_names=pact_names,
+        national=_NationalScenario(
+            merged_pacts=tuple(merged_pacts),
+            merged_label=merged_label,
+            seats=circ.seats,
+            loss_thresholds=loss_thresholds,
+        ),
+        original_allocation=original_allocation,
+        merged_allocation=merged_allocation,
+        distributed_allocation=distributed_allocation,
+        merged_breakdown=merged_breakdown,
+        baseline_seats=combined_original_seats,
+        merged_seats=merged_seats,
+        merged_votes=merged_votes,
     )
 
-    if processed_any:
-        _print_summary(
-            summary_official,
-            summary_scenario,
-            summary_scenario_by_origin,
-            pact_names,
-            summary_breakdowns,
-            national_loss,
-            national_merged_votes,
+
+def _flush_output(buffer: io.StringIO, out: TextIO) -> None:
+    out.write(buffer.getvalue())
+    buffer.seek(0)
+    buffer.truncate()
+
+
+def _sweep_pact_pairs(circunscripciones: Sequence[CircunscripcionResult]) -> List[_SweepResult]:
+    """Escaños de cada pareja de pactos por separado y unidos, sumando circunscripciones.
+
+    Todos los escenarios (pareja x circunscripción) se resuelven en una sola
+    llamada a ``dhondt_seat_counts_batch``.
+    """
+
+    codes = sorted({pact.code.upper() for circ in circunscripciones for pact in circ.pacts})
+    pairs = list(itertools.combinations(codes, 2))
+    if not pairs:
+        return []
+
+    width = max(len(circ.pacts) for circ in circunscripciones)
+    votes = np.zeros((len(pairs), len(circunscripciones), width))
+    code_rank = np.zeros(votes.shape, dtype=np.int64)
+    merged_position = np.zeros((len(pairs), len(circunscripciones)), dtype=np.int64)
+    has_merged = np.zeros(merged_position.shape, dtype=bool)
+    official = np.zeros(len(pairs), dtype=np.int64)
+
+    for circ_index, circ in enumerate(circunscripciones):
+        allocation = _cached_dhondt(circ.pacts, circ.seats)
+        for pair_index, pair in enumerate(pairs):
+            # Mismo criterio que ``_merge_pacts``: el pacto unido toma el lugar
+            # del primero de la pareja y suma los votos de ambos.
+            row_codes: List[str] = []
+            merged_codes: List[str] = []
+            first = -1
+            for position, pact in enumerate(circ.pacts):
+                row_codes.append(pact.code)
+                if pact.code.upper() in pair:
+                    merged_codes.append(pact.code)
+                    official[pair_index] += allocation.get(pact.code, 0)
+                    if first < 0:
+                        first = position
+                        votes[pair_index, circ_index, position] = pact.votes
+                    else:
+                        votes[pair_index, circ_index, first] += pact.votes
+                else:
+                    votes[pair_index, circ_index, position] = pact.votes
+            if first >= 0:
+                row_codes[first] = " + ".join(merged_codes)
+                merged_position[pair_index, circ_index] = first
+                has_merged[pair_index, circ_index] = True
+            order = sorted(range(len(row_codes)), key=row_codes.__getitem__)
+            code_rank[pair_index, circ_index, order] = np.arange(len(row_codes))
+
+    seats = np.array([circ.seats for circ in circunscripciones], dtype=np.int64)
+    counts = dhondt_seat_counts_batch(votes, seats, code_rank)
+    merged_counts = np.take_along_axis(counts, merged_position[:, :, None], axis=2)[:, :, 0]
+    scenario = np.where(has_merged, merged_counts, 0).sum(axis=1)
+
+    return [
+        _SweepResult(codes=pair, official_seats=int(official[index]), scenario_seats=int(scenario[index]))
+        for index, pair in enumerate(pairs)
+    ]
+
+
+def _print_sweep(results: Sequence[_SweepResult]) -> None:
+    print("\n=== Barrido de alianzas entre pares de pactos ===")
+    if not results:
+        print("   (sin datos)")
+        return
+    ordered = sorted(
+        results,
+        key=lambda item: (-(item.scenario_seats - item.official_seats), item.codes),
+    )
+    lines: List[str] = []
+    for item in ordered:
+        diff = item.scenario_seats - item.official_seats
+        sign = "+" if diff > 0 else ""
+        label = " + ".join(item.codes)
+        lines.append(
+            f"   {label}: {item.official_seats} -> {item.scenario_seats} escaños ({sign}{diff})"
         )
+    print("\n".join(lines))
 
 
 def _print_pact_table(pacts: Iterable[PactResult]) -> None:
-    print("Pactos disponibles:")
+    lines = ["Pactos disponibles:"]
     for pact in pacts:
-        print(
+        lines.append(
             f" - {pact.code}: {pact.name} ({pact.votes:,} votos, {len(pact.candidates)} candidatos)"
         )
+    print("\n".join(lines))
+
+
+def _by_seats(counts: Mapping[str, int]) -> List[Tuple[str, int]]:
+    """Pares ``(código, escaños)`` de más a menos escaños y luego por código."""
 
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
 
-def _print_allocation(allocation: Dict[str, int], pacts: Iterable[PactResult]) -> None:
-    pact_lookup = {pact.code: pact for pact in pacts}
+
+def _print_allocation(allocation: Dict[str, int], pact_lookup: Mapping[str, PactResult]) -> None:
     if not allocation:
         print("   No se asignaron escaños")
         return
-    for code, seats in sorted(allocation.items(), key=lambda item: (-item[1], item[0])):
+    lines: List[str] = []
+    for code, seats in _by_seats(allocation):
         pact = pact_lookup.get(code)
         name = pact.name if pact else "Pacto desconocido"
         votes = pact.votes if pact else 0
-        print(f"   {code}: {name} -> {seats} escaños ({votes:,} votos)")
+        lines.append(f"   {code}: {name} -> {seats} escaños ({votes:,} votos)")
+    print("\n".join(lines))
 
 
 def _merge_pacts(
-    pacts: Sequence[PactResult], codes: set[str]
-) -> Tuple[List[PactResult], str, List[str]]:
-    merged_candidates: List[CandidateResult] = []
+    pacts: Sequence[PactResult], codes: AbstractSet[str]
+) -> Tuple[List[PactResult], str, List[str], int]:
+    merged_sources: List[PactResult] = []
     merged_votes = 0
     merged_names: List[str] = []
     merged_codes: List[str] = []
@@ -196,7 +412,7 @@ def _merge_pacts(
     for pact in pacts:
         if pact.code.upper() in codes:
             merged_votes += pact.votes
-            merged_candidates.extend(pact.candidates)
+            merged_sources.append(pact)
             merged_names.append(pact.name)
             merged_codes.append(pact.code)
         else:
@@ -217,10 +433,19 @@ def _merge_pacts(
         percentage=None,
         candidate_slots=None,
         seats_won=None,
-        candidates=sorted(merged_candidates, key=lambda c: (-c.votes, c.number)),
+        candidates=list(
+            heapq.merge(
+                *(sorted(pact.candidates, key=candidate_sort_key) for pact in merged_sources),
+                key=candidate_sort_key,
+            )
+        ),
     )
     result.append(merged_pact)
-    return result, merged_label, merged_codes
+    return result, merged_label, merged_codes, merged_votes
+
+
+def _pact_lookup(pacts: Iterable[PactResult]) -> Dict[str, PactResult]:
+    return {pact.code: pact for pact in pacts}
 
 
 def _record_pact_names(pact_names: Dict[str, str], pacts: Iterable[PactResult]) -> None:
@@ -232,28 +457,69 @@ def _combined_seats(allocation: Dict[str, int], codes: Iterable[str]) -> int:
     return sum(allocation.get(code, 0) for code in codes)
 
 
-@dataclass(frozen=True)
-class _SubpactResult:
-    code: str
-    votes: int
+@dataclass(frozen=True, slots=True)
+class _CircReport:
+    """Lo que ``_process_circ`` entrega a ``main`` por cada circunscripción.
 
+    ``national`` es ``None`` cuando no se pudo armar el escenario unido.
+    """
 
-@dataclass(frozen=True)
+    text: str
+    pact_names: Dict[str, str]
+    national: _NationalScenario | None = None
+    original_allocation: Dict[str, int] = field(default_factory=dict)
+    merged_allocation: Dict[str, int] = field(default_factory=dict)
+    distributed_allocation: Counter[str] = field(default_factory=Counter)
+    merged_breakdown: Counter[str] = field(default_factory=Counter)
+    baseline_seats: int = 0
+    merged_seats: int = 0
+    merged_votes: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class _SweepResult:
+    codes: Tuple[str, str]
+    official_seats: int
+    scenario_seats: int
+
+
+@dataclass(frozen=True, slots=True)
 class _PactVotes:
     code: str
     votes: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class _NationalScenario:
     merged_pacts: Sequence[PactResult]
     merged_label: str
     seats: int
+    # ``_loss_thresholds`` para ``k`` de 0 a ``seats - 1``; se calcula si falta.
+    loss_thresholds: Tuple[float, ...] | None = None
+
+
+def _cached_dhondt(pacts: Iterable[SupportsDhondt], seats: int) -> Dict[str, int]:
+    """``dhondt_allocation`` recordando los repartos ya calculados.
+
+    Un mismo pacto (o subpacto) se reparte tanto en el escenario oficial como
+    en el simulado; la memoria se indexa por códigos, votos y escaños.
+    """
+
+    return dict(_dhondt_from_votes(tuple((pact.code, pact.votes) for pact in pacts), seats))
 
 
-def _winners_by_pact(pacts: Iterable[PactResult], allocation: Dict[str, int]) -> Dict[str, List[CandidateResult]]:
+@lru_cache(maxsize=4096)
+def _dhondt_from_votes(
+    entries: Tuple[Tuple[str, float], ...], seats: int
+) -> Tuple[Tuple[str, int], ...]:
+    pacts = [_PactVotes(code=code, votes=votes) for code, votes in entries]
+    return tuple(dhondt_allocation(pacts, seats).items())
+
+
+def _winners_by_pact(
+    pact_lookup: Mapping[str, PactResult], allocation: Dict[str, int]
+) -> Dict[str, List[CandidateResult]]:
     winners: Dict[str, List[CandidateResult]] = {}
-    pact_lookup = {pact.code: pact for pact in pacts}
     for code, seats in allocation.items():
         pact = pact_lookup.get(code)
         if not pact or seats <= 0:
@@ -262,20 +528,57 @@ def _winners_by_pact(pacts: Iterable[PactResult], allocation: Dict[str, int]) ->
     return winners
 
 
+def _merged_scenario_winners(
+    pact_lookup: Mapping[str, PactResult], allocation: Dict[str, int], merged_label: str
+) -> Tuple[Dict[str, List[CandidateResult]], Counter[str], Counter[str]]:
+    """Electos del escenario unido, recorriendo el reparto una sola vez.
+
+    Además de los electos por pacto entrega cuántos aporta cada pacto original
+    al pacto unido y el reparto con esos escaños atribuidos a su origen.
+    """
+
+    winners: Dict[str, List[CandidateResult]] = {}
+    breakdown: Counter[str] = Counter()
+    distributed: Counter[str] = Counter()
+    for code, seats in allocation.items():
+        pact = pact_lookup.get(code)
+        if not pact or seats <= 0:
+            distributed[code] += seats
+            continue
+        selected = winners[code] = _select_winners_from_pact(pact, seats)
+        if code == merged_label and selected:
+            for candidate in selected:
+                breakdown[candidate.pact_code or "(sin código)"] += 1
+            distributed.update(breakdown)
+        else:
+            distributed[code] += seats
+    return winners, breakdown, distributed
+
+
 def _select_winners_from_pact(pact: PactResult, seats: int) -> List[CandidateResult]:
     if not pact.candidates or seats <= 0:
         return []
-    subpact_seats = _subpact_allocation(pact, seats)
+    # Se ordena una vez por llamada y el mismo orden sirve para todo el
+    # reparto.
+    candidates = sorted(pact.candidates, key=candidate_sort_key)
+    if seats >= len(candidates):
+        # Resultan electas todas las candidaturas, así que no hace falta
+        # repartir entre subpactos.
+        return candidates[:seats]
+    # Cada candidatura se clasifica una sola vez; los mismos grupos sirven
+    # para sumar los votos de los subpactos y para elegir dentro de ellos.
+    # Al agrupar en el orden de preferencia, cada grupo ya queda ordenado.
+    candidates_by_subpact = _group_candidates_by_subpact(candidates)
+    subpact_seats = _subpact_allocation(candidates_by_subpact, seats)
     if not subpact_seats:
-        return _top_candidates(pact.candidates, seats)
+        return candidates[:seats]
 
-    candidates_by_subpact = _group_candidates_by_subpact(pact.candidates)
     selected: List[CandidateResult] = []
     selected_keys: set[tuple[int, int, str]] = set()
     for subpact_code, subpact_seats_count in subpact_seats.items():
         if subpact_seats_count <= 0:
             continue
-        ordered = _top_candidates(candidates_by_subpact.get(subpact_code, []), subpact_seats_count)
+        ordered = candidates_by_subpact.get(subpact_code, [])[:subpact_seats_count]
         for candidate in ordered:
             key = _candidate_identity(candidate)
             if key in selected_keys:
@@ -285,35 +588,37 @@ def _select_winners_from_pact(pact: PactResult, seats: int) -> List[CandidateRes
 
     if len(selected) < seats:
         remaining_needed = seats - len(selected)
-        fallback_candidates = [
+        fallback_candidates = (
             candidate
-            for candidate in _top_candidates(pact.candidates, len(pact.candidates))
+            for candidate in candidates
             if _candidate_identity(candidate) not in selected_keys
-        ]
-        selected.extend(fallback_candidates[:remaining_needed])
+        )
+        selected.extend(itertools.islice(fallback_candidates, remaining_needed))
 
-    selected.sort(key=_candidate_sort_key)
+    selected.sort(key=candidate_sort_key)
     return selected[:seats]
 
 
-def _subpact_allocation(pact: PactResult, seats: int) -> Dict[str, int]:
+def _subpact_allocation(
+    candidates_by_subpact: Mapping[str, Sequence[CandidateResult]], seats: int
+) -> Dict[str, int]:
     if seats <= 0:
         return {}
-    totals: Counter[str] = Counter()
-    for candidate in pact.candidates:
-        code = _candidate_subpact_code(candidate)
+    # Los totales van directo a la memoria de repartos como pares
+    # ``(código, votos)``, sin armar un objeto por subpacto.
+    entries: List[Tuple[str, float]] = []
+    for code, candidates in candidates_by_subpact.items():
         if not code:
             continue
-        totals[code] += max(candidate.votes, 0)
-
-    subpacts = [
-        _SubpactResult(code=code, votes=votes)
-        for code, votes in totals.items()
-        if votes > 0
-    ]
-    if not subpacts:
+        votes = sum(max(candidate.votes, 0) for candidate in candidates)
+        if votes > 0:
+            entries.append((code, votes))
+    if not entries:
         return {}
-    return dhondt_allocation(subpacts, seats)
+    if len(entries) == 1:
+        # Un único subpacto se lleva todos los escaños del pacto.
+        return {entries[0][0]: seats}
+    return dict(_dhondt_from_votes(tuple(entries), seats))
 
 
 def _group_candidates_by_subpact(candidates: Iterable[CandidateResult]) -> Dict[str, List[CandidateResult]]:
@@ -324,20 +629,22 @@ def _group_candidates_by_subpact(candidates: Iterable[CandidateResult]) -> Dict[
     return grouped
 
 
-def _top_candidates(candidates: Iterable[CandidateResult], seats: int) -> List[CandidateResult]:
-    ordered = sorted(candidates, key=_candidate_sort_key)
-    return ordered[:seats]
+def _candidate_subpact_code(candidate: CandidateResult) -> str:
+    return _subpact_code_for_party(candidate.party, candidate.pact_code)
 
 
-def _candidate_subpact_code(candidate: CandidateResult) -> str:
-    if candidate.party:
-        stripped = candidate.party.strip()
+@lru_cache(maxsize=1024)
+def _subpact_code_for_party(party: str | None, pact_code: str | None) -> str:
+    # Los partidos se repiten entre candidaturas, así que el resultado se
+    # recuerda por ``(partido, pacto)``.
+    if party:
+        stripped = party.strip()
         if stripped:
             normalized = _normalize_independent_party_label(stripped)
             if normalized:
                 return normalized
-    if candidate.pact_code:
-        return f"{candidate.pact_code} (sin partido)"
+    if pact_code:
+        return f"{pact_code} (sin partido)"
     return "(sin partido)"
 
 
@@ -354,10 +661,6 @@ def _normalize_independent_party_label(label: str) -> str:
     return label
 
 
-def _candidate_sort_key(candidate: CandidateResult) -> tuple[int, int, str]:
-    return (-candidate.votes, candidate.number, candidate.name)
-
-
 def _candidate_identity(candidate: CandidateResult) -> tuple[int, int, str]:
     return (candidate.number, candidate.votes, candidate.name)
 
@@ -369,12 +672,16 @@ def _has_result_changes(
     return _winner_signature(original_winners) != _winner_signature(merged_winners)
 
 
-def _winner_signature(winners: Dict[str, List[CandidateResult]]) -> Counter[tuple[str, int, str]]:
-    signature: Counter[tuple[str, int, str]] = Counter()
-    for candidates in winners.values():
-        for candidate in candidates:
-            signature[(candidate.pact_code or "", candidate.number, candidate.name)] += 1
-    return signature
+def _winner_signature(
+    winners: Dict[str, List[CandidateResult]],
+) -> frozenset[tuple[str, int, str]]:
+    # Cada candidatura aparece a lo sumo una vez (su número de papeleta es
+    # único en la circunscripción), así que basta un conjunto.
+    return frozenset(
+        (candidate.pact_code or "", candidate.number, candidate.name)
+        for candidates in winners.values()
+        for candidate in candidates
+    )
 
 
 def _print_winners(title: str, winners: Dict[str, List[CandidateResult]]) -> None:
@@ -382,31 +689,21 @@ def _print_winners(title: str, winners: Dict[str, List[CandidateResult]]) -> Non
     if not winners:
         print("   (sin información)")
         return
+    lines: List[str] = []
     for code, candidates in sorted(winners.items()):
         formatted = ", ".join(f"{c.name} ({c.votes:,} votos)" for c in candidates)
-        print(f"   {code}: {formatted}")
-
-
-def _merged_breakdown_counts(
-    merged_label: str, winners: Dict[str, List[CandidateResult]]
-) -> Counter[str]:
-    selected = winners.get(merged_label)
-    breakdown: Counter[str] = Counter()
-    if not selected:
-        return breakdown
-    for candidate in selected:
-        pact_code = candidate.pact_code or "(sin código)"
-        breakdown[pact_code] += 1
-    return breakdown
+        lines.append(f"   {code}: {formatted}")
+    print("\n".join(lines))
 
 
 def _print_merged_breakdown(merged_label: str, breakdown: Counter[str]) -> None:
     if not breakdown:
         return
-    print(f"      Detalle interno de {merged_label}:")
-    for code, count in sorted(breakdown.items(), key=lambda item: (-item[1], item[0])):
+    lines = [f"      Detalle interno de {merged_label}:"]
+    for code, count in _by_seats(breakdown):
         suffix = "escaños" if count != 1 else "escaño"
-        print(f"         - {code}: {count} {suffix}")
+        lines.append(f"         - {code}: {count} {suffix}")
+    print("\n".join(lines))
 
 
 def _print_indifference_loss(indifference_loss: float, merged_votes: float | None) -> None:
@@ -417,18 +714,6 @@ def _print_indifference_loss(indifference_loss: float, merged_votes: float | Non
     print(f"   Pérdida indiferente: {percentage:.2f}% (~{lost_votes:,} votos)")
 
 
-def _distribute_allocation_by_origin(
-    allocation: Dict[str, int], merged_label: str, breakdown: Counter[str]
-) -> Counter[str]:
-    distributed: Counter[str] = Counter()
-    for code, seats in allocation.items():
-        if code == merged_label and breakdown:
-            distributed.update(breakdown)
-        else:
-            distributed[code] += seats
-    return distributed
-
-
 def _print_summary(
     summary_official: Counter[str],
     summary_scenario: Counter[str],
@@ -442,7 +727,7 @@ def _print_summary(
     _print_summary_block("Reparto oficial", summary_official, pact_names)
     _print_summary_block("Escenario unificado", summary_scenario, pact_names)
 
-    print("\nVariación de escaños:")
+    lines = ["\nVariación de escaños:"]
     all_codes = sorted(set(summary_official) | set(summary_scenario_by_origin))
     for code in all_codes:
         original = summary_official.get(code, 0)
@@ -450,7 +735,8 @@ def _print_summary(
         diff = scenario - original
         sign = "+" if diff > 0 else ""
         label = _format_pact_label(code, pact_names)
-        print(f"   {label}: {original} -> {scenario} ({sign}{diff})")
+        lines.append(f"   {label}: {original} -> {scenario} ({sign}{diff})")
+    print("\n".join(lines))
 
     _print_national_indifference(national_loss, national_votes)
 
@@ -460,13 +746,20 @@ def _print_summary_block(title: str, data: Counter[str], pact_names: Dict[str, s
     if not data:
         print("   (sin datos)")
         return
-    for code, seats in sorted(data.items(), key=lambda item: (-item[1], item[0])):
+    lines: List[str] = []
+    for code, seats in _by_seats(data):
         label = _format_pact_label(code, pact_names)
-        print(f"   {label}: {seats} escaños")
+        lines.append(f"   {label}: {seats} escaños")
+    print("\n".join(lines))
 
 
 def _format_pact_label(code: str, pact_names: Dict[str, str]) -> str:
-    name = pact_names.get(code)
+    return _pact_label(code, pact_names.get(code))
+
+
+@lru_cache(maxsize=512)
+def _pact_label(code: str, name: str | None) -> str:
+    # Los mismos códigos se repiten en todos los bloques del resumen.
     if name and name != code:
         return f"{code} ({name})"
     return code
@@ -491,25 +784,33 @@ def _indifference_loss_percentage(
     seats: int,
     baseline_seats: int,
     current_merged_seats: int,
+    thresholds: Sequence[float] | None = None,
 ) -> float:
+    """Fracción de votos que el pacto unido puede perder sin bajar de ``baseline_seats``.
+
+    ``thresholds`` permite reutilizar el resultado de ``_loss_thresholds`` para
+    ``k`` de 0 a ``seats - 1``.
+    """
+
     if current_merged_seats <= baseline_seats:
         return 0.0
 
-    low = 0.0
-    high = 1.0
-    tolerance = 1e-4
-    for _ in range(60):
-        mid = (low + high) / 2
-        scenario = _pacts_with_vote_loss(merged_pacts, merged_label, mid)
-        allocation = dhondt_allocation(scenario, seats)
-        seats_mid = allocation.get(merged_label, 0)
-        if seats_mid > baseline_seats:
-            low = mid
-        else:
-            high = mid
-        if high - low <= tolerance:
-            break
-    return high
+    if thresholds is not None:
+        threshold = thresholds[baseline_seats]
+    else:
+        (threshold,) = _loss_thresholds(merged_pacts, merged_label, seats, [baseline_seats])
+
+    # La comprobación trabaja sobre votos planos: el pacto unido va primero,
+    # como en ``_pacts_with_vote_loss``.
+    scenario = _pacts_with_vote_loss(merged_pacts, merged_label, 0.0)
+    votes = np.array([[item.votes for item in scenario]])
+    codes = [item.code for item in scenario]
+
+    def keeps_extra_seats(loss: float) -> bool:
+        row = _redistribute_loss(votes, loss)[0].tolist()
+        return dhondt_seat_counts(row, seats, codes)[0] > baseline_seats
+
+    return _settle_threshold(threshold, keeps_extra_seats)
 
 
 def _national_indifference_loss(
@@ -520,23 +821,125 @@ def _national_indifference_loss(
     if not circunscripciones or current_total <= baseline_total:
         return 0.0
 
-    low = 0.0
-    high = 1.0
-    tolerance = 1e-4
-    for _ in range(60):
-        mid = (low + high) / 2
-        total = 0
-        for circ in circunscripciones:
-            scenario = _pacts_with_vote_loss(circ.merged_pacts, circ.merged_label, mid)
-            allocation = dhondt_allocation(scenario, circ.seats)
-            total += allocation.get(circ.merged_label, 0)
-        if total > baseline_total:
-            low = mid
+    # Con una pérdida ``f`` el pacto unido obtiene, en cada circunscripción,
+    # tantos escaños como umbrales de esa circunscripción superen a ``f``. El
+    # total nacional baja a ``baseline_total`` en el umbral número
+    # ``baseline_total + 1`` de mayor a menor.
+    thresholds: List[float] = []
+    for circ in circunscripciones:
+        if circ.loss_thresholds is not None:
+            thresholds.extend(circ.loss_thresholds)
         else:
-            high = mid
-        if high - low <= tolerance:
-            break
-    return high
+            thresholds.extend(
+                _loss_thresholds(
+                    circ.merged_pacts, circ.merged_label, circ.seats, range(circ.seats)
+                )
+            )
+    ranked = heapq.nlargest(baseline_total + 1, thresholds)
+    threshold = ranked[baseline_total] if len(ranked) > baseline_total else 0.0
+
+    # Todas las circunscripciones se comprueban juntas sobre una sola matriz.
+    votes, code_rank, seats = _national_vote_matrix(circunscripciones)
+
+    def keeps_extra_seats(loss: float) -> bool:
+        counts = dhondt_seat_counts_batch(_redistribute_loss(votes, loss), seats, code_rank)
+        return int(counts[:, 0].sum()) > baseline_total
+
+    return _settle_threshold(threshold, keeps_extra_seats)
+
+
+def _national_vote_matrix(
+    circunscripciones: Sequence[_NationalScenario],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Votos, orden de códigos y escaños de cada circunscripción, una fila por cada una.
+
+    El pacto unido queda en la primera columna y el resto en el orden de
+    ``_pacts_with_vote_loss``; las filas se rellenan con ceros.
+    """
+
+    scenarios = [
+        _pacts_with_vote_loss(circ.merged_pacts, circ.merged_label, 0.0)
+        for circ in circunscripciones
+    ]
+    width = max(len(scenario) for scenario in scenarios)
+    votes = np.zeros((len(scenarios), width))
+    code_rank = np.zeros(votes.shape, dtype=np.int64)
+    for row, scenario in enumerate(scenarios):
+        votes[row, : len(scenario)] = [item.votes for item in scenario]
+        order = sorted(range(len(scenario)), key=lambda index: scenario[index].code)
+        code_rank[row, order] = np.arange(len(scenario))
+    seats = np.array([circ.seats for circ in circunscripciones], dtype=np.int64)
+    return votes, code_rank, seats
+
+
+def _redistribute_loss(votes: np.ndarray, loss_fraction: float) -> np.ndarray:
+    """``_pacts_with_vote_loss`` sobre una matriz de ``_national_vote_matrix``."""
+
+    lost = votes[:, 0] * loss_fraction
+    others = votes[:, 1:]
+    other_totals = others.sum(axis=1, keepdims=True)
+    shares = np.divide(others, other_totals, out=np.zeros_like(others), where=other_totals > 0)
+    result = np.empty_like(votes)
+    result[:, 0] = votes[:, 0] - lost
+    result[:, 1:] = others + lost[:, None] * shares
+    return result
+
+
+def _loss_thresholds(
+    merged_pacts: Sequence[PactResult],
+    merged_label: str,
+    seats: int,
+    seat_counts: Iterable[int],
+) -> List[float]:
+    """Pérdida a partir de la cual el pacto unido deja de obtener más de ``k`` escaños.
+
+    Se entrega un valor por cada ``k`` de ``seat_counts``. La pérdida se reparte
+    entre los demás pactos en proporción a sus votos (como en
+    ``_pacts_with_vote_loss``), así que todas sus cuotas crecen por el mismo
+    factor ``1 + f·M/S`` y su orden no cambia: basta comparar la cuota
+    ``M·(1 - f)/(k + 1)`` del pacto unido con la cuota rival que compite por
+    el mismo escaño.
+    """
+
+    merged_votes = _pact_votes(merged_pacts, merged_label)
+    if merged_votes is None:
+        raise ValueError("No se encontró el pacto unificado dentro del escenario")
+
+    other_votes = [
+        float(pact.votes) for pact in merged_pacts if pact.code != merged_label and pact.votes > 0
+    ]
+    other_total = sum(other_votes)
+    rivals = heapq.nlargest(
+        seats, (votes / divisor for votes in other_votes for divisor in range(1, seats + 1))
+    )
+
+    thresholds: List[float] = []
+    for k in seat_counts:
+        own = merged_votes / (k + 1)
+        position = seats - k - 1
+        rival = rivals[position] if 0 <= position < len(rivals) else 0.0
+        if position < 0 or own <= 0:
+            thresholds.append(0.0)
+        elif rival <= 0:
+            thresholds.append(1.0)
+        else:
+            loss = (own - rival) / (own + rival * merged_votes / other_total)
+            thresholds.append(min(max(loss, 0.0), 1.0))
+    return thresholds
+
+
+def _settle_threshold(loss: float, keeps_extra_seats: Callable[[float], bool]) -> float:
+    """Sube ``loss`` lo mínimo para que el escenario ya no supere la base.
+
+    En el umbral exacto las cuotas empatan (y decide el desempate de D'Hondt)
+    o el redondeo puede dejarlo apenas por debajo.
+    """
+
+    step = 1e-12
+    while loss < 1.0 and keeps_extra_seats(loss):
+        loss = min(1.0, loss + step)
+        step *= 2
+    return loss
 
 
 def _pacts_with_vote_loss(
@@ -582,5 +985,4 @@ def _pact_votes(pacts: Sequence[PactResult], code: str) -> float | None:
 
 if __name__ == "__main__":
     main()
-_IND_PARTY_PATTERN = re.compile(r"^IND\s*-\s*(.+)$", re.IGNORECASE)
 
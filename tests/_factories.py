@@ -0,0 +1,41 @@
+"""Constructores de resultados compartidos por las pruebas."""
+from __future__ import annotations
+
+from analisis_electoral.data_loader import CandidateResult, CircunscripcionResult, PactResult
+
+
+def _candidate(number: int, votes: int, pact_code: str) -> CandidateResult:
+    return CandidateResult(
+        number=number,
+        name=f"{pact_code}{number}",
+        party=None,
+        votes=votes,
+        percentage=None,
+        elected=False,
+        pact_code=pact_code,
+    )
+
+
+def _pact(code: str, *votes: int) -> PactResult:
+    """Pacto ``code`` con una candidatura por cada valor de ``votes``."""
+
+    candidates = [_candidate(index + 1, value, code) for index, value in enumerate(votes)]
+    return PactResult(
+        code=code,
+        name=f"Pacto {code}",
+        label=code,
+        votes=sum(votes),
+        percentage=None,
+        candidate_slots=None,
+        seats_won=None,
+        candidates=candidates,
+    )
+
+
+def _circ(circ_id: str, seats: int, pacts) -> CircunscripcionResult:
+    return CircunscripcionResult(
+        circunscripcion_id=circ_id,
+        circunscripcion_label=f"Distrito {circ_id}",
+        seats=seats,
+        pacts=list(pacts),
+    )
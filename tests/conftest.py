@@ -3,7 +3,21 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
+
+
+@pytest.fixture(autouse=True)
+def _clear_simulation_caches():
+    """Cada prueba parte sin los repartos y etiquetas memorizados por otras."""
+
+    from analisis_electoral import simulation
+
+    yield
+    simulation._dhondt_from_votes.cache_clear()
+    simulation._subpact_code_for_party.cache_clear()
+    simulation._pact_label.cache_clear()
@@ -0,0 +1,38 @@
+import io
+
+from _factories import _circ, _pact
+
+from analisis_electoral import simulation
+
+
+def _run(monkeypatch, *extra_args: str) -> str:
+    circunscripciones = [
+        # Por separado C y D se reparten los tres escaños; unidos, A y B le
+        # quitan el suyo a D.
+        _circ(
+            "1",
+            3,
+            [_pact("A", 200, 100), _pact("B", 300), _pact("C", 1000), _pact("D", 450)],
+        ),
+        # Solo compite A, así que el escenario coincide con el oficial.
+        _circ("2", 1, [_pact("A", 1000), _pact("C", 3000)]),
+    ]
+    monkeypatch.setattr(
+        simulation, "load_circunscripciones", lambda inputs, max_workers=1: circunscripciones
+    )
+
+    out = io.StringIO()
+    simulation.main(["--pact-a", "A", "--pact-b", "B", *extra_args], out=out)
+    return out.getvalue()
+
+
+def test_each_changed_circ_is_reported_once(monkeypatch):
+    text = _run(monkeypatch)
+
+    assert text.count("=== Distrito 1 (3 escaños) ===") == 1
+    assert "=== Distrito 2" not in text
+    assert text.count("=== Resumen consolidado ===") == 1
+
+
+def test_parallel_run_matches_serial_output(monkeypatch):
+    assert _run(monkeypatch, "--print-all", "--jobs", "2") == _run(monkeypatch, "--print-all")
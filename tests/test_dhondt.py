@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from analisis_electoral.dhondt import (
+    dhondt_allocation,
+    dhondt_quotients,
+    dhondt_seat_counts,
+    dhondt_seat_counts_batch,
+)
+
+
+@dataclass
+class _Pact:
+    code: str
+    votes: float
+
+
+def test_allocation_follows_highest_quotients():
+    pacts = [_Pact("A", 1800), _Pact("B", 1000), _Pact("C", 600)]
+
+    assert dhondt_allocation(pacts, 3) == {"A": 2, "B": 1}
+    assert dhondt_allocation(pacts, 5) == {"A": 3, "B": 1, "C": 1}
+
+
+def test_ties_prefer_more_votes_then_code():
+    # 600/2 empata con 300/1: gana la lista con más votos.
+    assert dhondt_allocation([_Pact("B", 300), _Pact("A", 600)], 2) == {"A": 2}
+    # Empate total de votos: decide el código.
+    assert dhondt_allocation([_Pact("Z", 500), _Pact("Y", 500)], 1) == {"Y": 1}
+    assert dhondt_allocation([_Pact("AB", 500), _Pact("A", 500)], 1) == {"A": 1}
+
+
+def test_pacts_without_votes_are_ignored():
+    pacts = [_Pact("A", 0), _Pact("B", -10), _Pact("C", 10)]
+
+    assert dhondt_allocation(pacts, 2) == {"C": 2}
+    assert dhondt_allocation(pacts, 0) == {}
+    assert dhondt_allocation([], 3) == {}
+
+
+def test_quotient_table_matches_allocation():
+    pacts = [_Pact("A", 1800), _Pact("B", 1000), _Pact("C", 600)]
+
+    table = dhondt_quotients(pacts, 3)
+
+    assert len(table) == 9
+    assert [(seat.pact_code, seat.divisor) for seat in table[:3]] == [
+        ("A", 1),
+        ("B", 1),
+        ("A", 2),
+    ]
+
+
+def test_seat_counts_work_on_plain_votes():
+    assert dhondt_seat_counts([1800, 0, 1000, 600], 5) == [3, 0, 1, 1]
+    # Sin códigos, el empate lo gana la posición menor.
+    assert dhondt_seat_counts([500, 500], 1) == [1, 0]
+    assert dhondt_seat_counts([500, 500], 1, ["Z", "Y"]) == [0, 1]
+
+
+def test_large_allocations_match_proportions():
+    pacts = [_Pact("A", 600_000), _Pact("B", 300_000), _Pact("C", 100_000)]
+
+    assert dhondt_allocation(pacts, 100) == {"A": 60, "B": 30, "C": 10}
+    # Empate exacto en la última cuota con muchos escaños: decide el código.
+    assert dhondt_seat_counts([300, 300], 101, ["B", "A"]) == [50, 51]
+
+
+def test_batch_matches_single_allocations():
+    votes = [[1800, 1000, 600, 0], [500, 500, 0, 0], [30, 70, 20, 10]]
+    seats = [5, 3, 8]
+
+    counts = dhondt_seat_counts_batch(votes, seats)
+
+    for row, row_seats, row_counts in zip(votes, seats, counts.tolist()):
+        assert row_counts == dhondt_seat_counts(row, row_seats)
@@ -8,7 +8,9 @@ from analisis_electoral.simulation import (
     _NationalScenario,
     _indifference_loss_percentage,
     _national_indifference_loss,
+    _national_vote_matrix,
     _pacts_with_vote_loss,
+    _redistribute_loss,
 )
 
 
@@ -141,8 +143,9 @@ def test_vote_loss_is_distributed_to_null_and_blank_lists():
     loss_fraction = 0.2
     scenario = _pacts_with_vote_loss(merged_pacts, merged_label, loss_fraction)
 
-    nb_votes = next(item.votes for item in scenario if item.code == "NB")
-    c_votes = next(item.votes for item in scenario if item.code == "C")
+    votes_by_code = {item.code: item.votes for item in scenario}
+    nb_votes = votes_by_code["NB"]
+    c_votes = votes_by_code["C"]
 
     assert nb_votes > 250
     assert c_votes > 500
@@ -150,3 +153,41 @@ def test_vote_loss_is_distributed_to_null_and_blank_lists():
     original_total = sum(float(p.votes) for p in merged_pacts)
     redistributed_total = sum(item.votes for item in scenario)
     assert redistributed_total == pytest.approx(original_total)
+
+
+def test_indifference_loss_is_exact_threshold():
+    merged_label = "A+B"
+    merged_pacts = [
+        _pact(merged_label, 1800),
+        _pact("C", 1000),
+        _pact("D", 600),
+    ]
+
+    loss = _indifference_loss_percentage(merged_pacts, merged_label, 3, 1, 2)
+
+    # La segunda cuota del pacto unido (900) empata con la de D (600) escalada
+    # por los votos que D recibe: 900·(1 - f) = 600·(1 + f·1800/1600).
+    assert loss == pytest.approx(300 / 1575)
+
+
+def test_vote_matrix_redistribution_matches_scenarios():
+    merged_label = "A+B"
+    circunscripciones = [
+        _NationalScenario(
+            merged_pacts=(_pact("C", 1000), _pact(merged_label, 1800), _pact("D", 600)),
+            merged_label=merged_label,
+            seats=3,
+        ),
+        _NationalScenario(
+            merged_pacts=(_pact(merged_label, 2000), _pact("E", 0)),
+            merged_label=merged_label,
+            seats=2,
+        ),
+    ]
+
+    votes, _, _ = _national_vote_matrix(circunscripciones)
+    redistributed = _redistribute_loss(votes, 0.25)
+
+    for row, circ in zip(redistributed.tolist(), circunscripciones):
+        scenario = _pacts_with_vote_loss(circ.merged_pacts, merged_label, 0.25)
+        assert row[: len(scenario)] == [item.votes for item in scenario]
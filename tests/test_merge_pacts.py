@@ -0,0 +1,16 @@
+from _factories import _pact
+
+from analisis_electoral.simulation import _merge_pacts
+
+
+def test_merged_pact_keeps_candidates_ordered_by_votes():
+    pacts = [_pact("A", 100, 700), _pact("B", 400, 900), _pact("C", 500)]
+
+    result, merged_label, merged_codes, merged_votes = _merge_pacts(pacts, {"A", "B"})
+
+    assert merged_label == "A + B"
+    assert merged_codes == ["A", "B"]
+    assert [pact.code for pact in result] == ["C", "A + B"]
+    merged = result[-1]
+    assert merged.votes == merged_votes == 2100
+    assert [candidate.votes for candidate in merged.candidates] == [900, 700, 400, 100]
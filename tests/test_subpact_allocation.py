@@ -39,7 +39,7 @@ def test_subpact_allocation_uses_party_votes():
     )
 
     allocation = {pact_code: 2}
-    winners = _winners_by_pact([pact], allocation)
+    winners = _winners_by_pact({pact_code: pact}, allocation)
     assert [candidate.name for candidate in winners[pact_code]] == ["A1", "B1"]
 
 
@@ -60,5 +60,5 @@ def test_candidates_without_party_are_still_selected_by_votes():
     )
 
     allocation = {pact_code: 2}
-    winners = _winners_by_pact([pact], allocation)
+    winners = _winners_by_pact({pact_code: pact}, allocation)
     assert [candidate.name for candidate in winners[pact_code]] == ["Ind1", "Ind2"]
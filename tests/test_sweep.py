@@ -0,0 +1,68 @@
+import pytest
+from _factories import _circ, _pact
+
+from analisis_electoral import simulation
+from analisis_electoral.dhondt import dhondt_allocation
+from analisis_electoral.simulation import _merge_pacts, _sweep_pact_pairs
+
+
+CIRCUNSCRIPCIONES = [
+    # Unidos, A y B le quitan a C uno de los dos escaños.
+    _circ("1", 2, [_pact("A", 250, 150), _pact("B", 300, 100), _pact("C", 1000)]),
+    _circ("2", 3, [_pact("A", 700, 200), _pact("C", 1200, 300), _pact("D", 500)]),
+    # B y D empatan; el desempate de D'Hondt decide por código.
+    _circ("3", 3, [_pact("B", 600), _pact("C", 900, 400), _pact("D", 600)]),
+]
+
+
+def _pair_seats(pair) -> tuple[int, int]:
+    official = scenario = 0
+    for circ in CIRCUNSCRIPCIONES:
+        allocation = dhondt_allocation(circ.pacts, circ.seats)
+        official += sum(
+            allocation.get(pact.code, 0) for pact in circ.pacts if pact.code.upper() in pair
+        )
+        try:
+            merged_pacts, merged_label = _merge_pacts(circ.pacts, set(pair))[:2]
+        except ValueError:
+            continue
+        scenario += dhondt_allocation(merged_pacts, circ.seats).get(merged_label, 0)
+    return official, scenario
+
+
+def test_sweep_matches_per_circ_scenarios():
+    results = _sweep_pact_pairs(CIRCUNSCRIPCIONES)
+
+    assert [result.codes for result in results] == [
+        ("A", "B"),
+        ("A", "C"),
+        ("A", "D"),
+        ("B", "C"),
+        ("B", "D"),
+        ("C", "D"),
+    ]
+    for result in results:
+        assert (result.official_seats, result.scenario_seats) == _pair_seats(result.codes)
+
+
+def test_sweep_cli_prints_every_pact_pair(monkeypatch, capsys):
+    monkeypatch.setattr(
+        simulation, "load_circunscripciones", lambda inputs, max_workers=1: CIRCUNSCRIPCIONES[:1]
+    )
+
+    simulation.main(["--sweep"])
+
+    assert capsys.readouterr().out == (
+        "\n=== Barrido de alianzas entre pares de pactos ===\n"
+        "   A + B: 0 -> 1 escaños (+1)\n"
+        "   A + C: 2 -> 2 escaños (0)\n"
+        "   B + C: 2 -> 2 escaños (0)\n"
+    )
+
+
+@pytest.mark.parametrize("extra", [["--pact-a", "A"], ["--pact-b", "B"], ["--print-all"]])
+def test_sweep_rejects_pair_options(extra, capsys):
+    with pytest.raises(SystemExit):
+        simulation.main(["--sweep", *extra])
+
+    assert "--sweep no admite" in capsys.readouterr().err
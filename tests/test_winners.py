@@ -15,6 +15,7 @@ def _candidate(number: int, name: str, party: str, votes: int, pact_code: str =
 
 
 def _pact(candidates):
+    candidates = list(candidates)
     return PactResult(
         code="C",
         name="Unidad Por Chile",
@@ -23,7 +24,7 @@ def _pact(candidates):
         percentage=None,
         candidate_slots=None,
         seats_won=None,
-        candidates=list(candidates),
+        candidates=candidates,
     )
 
 
@@ -53,3 +54,24 @@ def test_plain_independent_remains_its_own_subpact():
     candidate = _candidate(1, "Laura Iturriaga", "IND", 42000)
 
     assert _candidate_subpact_code(candidate) == "IND"
+
+
+def test_winners_follow_reassigned_candidates():
+    pact = _pact([_candidate(number, f"N{number}", "PS", 100 * number) for number in (1, 2, 3)])
+    _select_winners_from_pact(pact, 2)
+
+    pact.candidates = [_candidate(number, f"N{number}", "PS", 100 * number) for number in (5, 6, 7)]
+
+    assert [candidate.name for candidate in _select_winners_from_pact(pact, 2)] == ["N7", "N6"]
+
+
+def test_all_candidates_win_when_seats_cover_the_list():
+    candidates = [
+        _candidate(3, "Candidata PS", "PS", 1000),
+        _candidate(1, "Candidata PPD", "PPD", 4000),
+        _candidate(2, "Candidata IND", "IND - PPD", 1000),
+    ]
+
+    winners = _select_winners_from_pact(_pact(candidates), 5)
+
+    assert [candidate.number for candidate in winners] == [1, 2, 3]